@@ -3,6 +3,7 @@
 VFS Booking Bot - Main Entry Point
 """
 import asyncio
+import os
 import sys
 from pathlib import Path
 
@@ -12,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 import uvicorn
 from loguru import logger
 
-from src.app.config import settings
+from src.app.config import settings, uvicorn_fast_options
 from src.app.database import init_db
 
 
@@ -21,14 +22,19 @@ def setup_logging():
     log_file = settings.logs_dir / "vfs_bot.log"
     settings.logs_dir.mkdir(parents=True, exist_ok=True)
 
+    # enqueue=True moves formatting and writes off the calling (event loop) thread;
+    # backtrace/diagnose are off to skip loguru's frame inspection on exceptions
     logger.remove()
-    logger.add(sys.stderr, level="INFO")
+    logger.add(sys.stderr, level="INFO", enqueue=True, backtrace=False, diagnose=False)
     logger.add(
         log_file,
         rotation="10 MB",
         retention="7 days",
         level="DEBUG",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
     )
 
 
@@ -63,9 +69,40 @@ def run_api():
         port=settings.api_port,
         reload=True,
         log_level="info",
+        **uvicorn_fast_options(),
     )
 
 
+def run_api_prod():
+    """Run API server under Gunicorn with UvicornWorker processes (no reload)
+
+    Bot control state (/api/bot/*) lives in the worker process that started
+    the bot, so keep API_WORKERS=1 unless the dashboard is only used for
+    applicant/booking management.
+    """
+    if sys.platform == "win32":
+        logger.error("Gunicorn is not available on Windows, use 'api' instead")
+        return
+
+    # Create tables/indexes once before forking workers
+    asyncio.run(init())
+
+    logger.info(
+        f"Starting API server on {settings.api_host}:{settings.api_port} "
+        f"with {settings.api_workers} worker(s)"
+    )
+    # execvp skips atexit, so flush the enqueued log messages first
+    logger.complete()
+    os.execvp("gunicorn", [
+        "gunicorn",
+        "src.app.main:app",
+        "--worker-class", "uvicorn_worker.UvicornWorker",
+        "--workers", str(settings.api_workers),
+        "--bind", f"{settings.api_host}:{settings.api_port}",
+        "--chdir", str(Path(__file__).parent),
+    ])
+
+
 async def run_bot():
     """Run bot in standalone mode"""
     from src.automation.browser import BrowserManager
@@ -127,14 +164,17 @@ def main():
     parser = argparse.ArgumentParser(description="VFS Booking Bot")
     parser.add_argument(
         "command",
-        choices=["api", "bot", "init"],
-        help="Command to run: api (start API server), bot (run bot standalone), init (initialize database)",
+        choices=["api", "api-prod", "bot", "init"],
+        help="Command to run: api (start API server), api-prod (API server under Gunicorn), "
+             "bot (run bot standalone), init (initialize database)",
     )
 
     args = parser.parse_args()
 
     if args.command == "api":
         run_api()
+    elif args.command == "api-prod":
+        run_api_prod()
     elif args.command == "bot":
         asyncio.run(run_bot())
     elif args.command == "init":
@@ -1,6 +1,8 @@
 """
 Configuration settings for VFS Booking Bot
 """
+import sys
+from functools import cached_property
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from typing import Optional
@@ -42,15 +44,17 @@ class Settings(BaseSettings):
     # API Server
     api_host: str = Field(default="127.0.0.1", description="API server host")
     api_port: int = Field(default=8000, description="API server port")
+    api_workers: int = Field(default=1, description="Gunicorn worker processes for 'run.py api-prod'")
+    stats_cache_ttl: float = Field(default=2.0, description="Seconds to cache /api/stats between writes")
 
     # Paths
     base_dir: Path = Field(default=Path(__file__).parent.parent.parent, description="Base directory")
 
-    @property
+    @cached_property
     def screenshots_dir(self) -> Path:
         return self.base_dir / "data" / "screenshots"
 
-    @property
+    @cached_property
     def logs_dir(self) -> Path:
         return self.base_dir / "data" / "logs"
 
@@ -199,3 +203,14 @@ BOOKING_STATUS = [
 
 # Global settings instance
 settings = Settings()
+
+
+def uvicorn_fast_options() -> dict:
+    """uvicorn options for the uvloop event loop and httptools parser.
+
+    uvloop has no Windows support (and Playwright needs the Proactor loop
+    there), so Windows keeps uvicorn's defaults.
+    """
+    if sys.platform == "win32":
+        return {}
+    return {"loop": "uvloop", "http": "httptools", "access_log": False}
@@ -1,43 +1,121 @@
 """
 CRUD operations for database models
 """
-from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import select, update, delete, func
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Select, select, update, delete, func, case, true, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
 from .models import Applicant, Booking, BookingLog, Session, Settings, Video
 
+# Rows fetched per round-trip by the stream_* helpers
+STREAM_BATCH_SIZE = 100
+
+
+# ============== Prebuilt Statements ==============
+# Built once at import; runtime values are passed as bind parameters.
+
+_GET_APPLICANT = select(Applicant).where(Applicant.id == bindparam("id"))
+_GET_APPLICANT_WITH_VIDEOS = _GET_APPLICANT.options(selectinload(Applicant.videos))
+_GET_APPLICANT_BY_PASSPORT = select(Applicant).where(Applicant.passport_number == bindparam("passport_number"))
+_GET_VIDEOS_FOR_APPLICANT = (
+    select(Video)
+    .where(Video.applicant_id == bindparam("applicant_id"))
+    .order_by(Video.created_at, Video.id)
+)
+_GET_BOOKING = select(Booking).options(joinedload(Booking.logs)).where(Booking.id == bindparam("id"))
+_BOOKING_EXISTS = select(Booking.id).where(Booking.id == bindparam("id"))
+_GET_BOOKING_LOGS = (
+    select(BookingLog)
+    .where(BookingLog.booking_id == bindparam("booking_id"))
+    .order_by(BookingLog.created_at, BookingLog.id)
+)
+_GET_ACTIVE_SESSION = select(Session).where(Session.name == bindparam("name"), Session.is_active == True)
+_GET_SETTING_VALUE = select(Settings.value).where(Settings.key == bindparam("key"))
+
+_APPLICANT_STATS = select(
+    func.count(Applicant.id).label("total_applicants"),
+    func.sum(case((Applicant.status == "pending", 1), else_=0)).label("pending_applicants"),
+    func.sum(case((Applicant.status == "booked", 1), else_=0)).label("booked_applicants"),
+    func.sum(case((Applicant.status == "failed", 1), else_=0)).label("failed_applicants"),
+).subquery()
+_BOOKING_STATS = select(
+    func.count(Booking.id).label("total_bookings"),
+    func.sum(case((Booking.status == "success", 1), else_=0)).label("successful_bookings"),
+    func.sum(case((Booking.status == "failed", 1), else_=0)).label("failed_bookings"),
+    func.avg(case((Booking.status == "success", Booking.attempts))).label("average_attempts"),
+    func.max(case((Booking.status == "success", Booking.updated_at))).label("last_successful_booking"),
+).subquery()
+# Both subqueries yield exactly one row; join them side by side
+_STATISTICS = (
+    select(_APPLICANT_STATS, _BOOKING_STATS)
+    .select_from(_APPLICANT_STATS.join(_BOOKING_STATS, true()))
+)
+
 
 # ============== Applicant CRUD ==============
 
-async def create_applicant(db: AsyncSession, **kwargs) -> Applicant:
-    """Create a new applicant"""
-    applicant = Applicant(**kwargs)
-    db.add(applicant)
+async def create_applicant_if_new(db: AsyncSession, **kwargs) -> Optional[Applicant]:
+    """Create an applicant unless the passport number already exists
+
+    Single atomic INSERT ... ON CONFLICT DO NOTHING; returns None on duplicate.
+    """
+    result = await db.execute(
+        sqlite_insert(Applicant)
+        .values(**kwargs)
+        .on_conflict_do_nothing(index_elements=[Applicant.passport_number])
+        .returning(Applicant)
+    )
+    applicant = result.scalar_one_or_none()
     await db.commit()
-    await db.refresh(applicant)
     return applicant
 
 
+async def bulk_create_applicants(db: AsyncSession, rows: List[dict]) -> List[int]:
+    """Insert many applicants, skipping passport numbers that already exist
+
+    Runs as batched multi-row INSERT ... ON CONFLICT DO NOTHING; returns the
+    ids of the rows actually inserted.
+    """
+    if not rows:
+        return []
+    result = await db.scalars(
+        sqlite_insert(Applicant)
+        .on_conflict_do_nothing(index_elements=[Applicant.passport_number])
+        .returning(Applicant.id),
+        rows,
+    )
+    ids = list(result)
+    await db.commit()
+    return ids
+
+
 async def get_applicant(db: AsyncSession, applicant_id: int, load_videos: bool = False) -> Optional[Applicant]:
     """Get applicant by ID"""
-    query = select(Applicant).where(Applicant.id == applicant_id)
-    if load_videos:
-        query = query.options(selectinload(Applicant.videos))
-    result = await db.execute(query)
+    query = _GET_APPLICANT_WITH_VIDEOS if load_videos else _GET_APPLICANT
+    result = await db.execute(query, {"id": applicant_id})
     return result.scalar_one_or_none()
 
 
 async def get_applicant_by_passport(db: AsyncSession, passport_number: str) -> Optional[Applicant]:
     """Get applicant by passport number"""
-    result = await db.execute(
-        select(Applicant).where(Applicant.passport_number == passport_number)
-    )
+    result = await db.execute(_GET_APPLICANT_BY_PASSPORT, {"passport_number": passport_number})
     return result.scalar_one_or_none()
 
 
+def _applicants_query(skip: int, limit: int, status: Optional[str], load_videos: bool) -> Select:
+    """Build the applicant listing query"""
+    query = select(Applicant).order_by(Applicant.priority.desc(), Applicant.created_at, Applicant.id)
+
+    if status:
+        query = query.where(Applicant.status == status)
+    if load_videos:
+        query = query.options(selectinload(Applicant.videos))
+
+    return query.offset(skip).limit(limit)
+
+
 async def get_applicants(
     db: AsyncSession,
     skip: int = 0,
@@ -46,27 +124,32 @@ async def get_applicants(
     load_videos: bool = False
 ) -> List[Applicant]:
     """Get list of applicants"""
-    query = select(Applicant).order_by(Applicant.priority.desc(), Applicant.created_at)
+    result = await db.execute(_applicants_query(skip, limit, status, load_videos))
+    return list(result.scalars().all())
 
-    if status:
-        query = query.where(Applicant.status == status)
-    if load_videos:
-        query = query.options(selectinload(Applicant.videos))
 
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+async def stream_applicants(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None
+) -> AsyncScalarResult:
+    """Stream applicants without materializing the whole page"""
+    return await db.stream_scalars(_applicants_query(skip, limit, status, load_videos=False))
 
 
 async def update_applicant(db: AsyncSession, applicant_id: int, **kwargs) -> Optional[Applicant]:
     """Update an applicant"""
-    await db.execute(
+    result = await db.execute(
         update(Applicant)
         .where(Applicant.id == applicant_id)
-        .values(**kwargs, updated_at=datetime.utcnow())
+        .values(**kwargs)
+        .returning(Applicant),
+        execution_options={"populate_existing": True},
     )
+    applicant = result.scalar_one_or_none()
     await db.commit()
-    return await get_applicant(db, applicant_id)
+    return applicant
 
 
 async def delete_applicant(db: AsyncSession, applicant_id: int) -> bool:
@@ -94,17 +177,12 @@ async def create_video(db: AsyncSession, **kwargs) -> Video:
     video = Video(**kwargs)
     db.add(video)
     await db.commit()
-    await db.refresh(video)
     return video
 
 
 async def get_videos_for_applicant(db: AsyncSession, applicant_id: int) -> List[Video]:
     """Get all videos for an applicant"""
-    result = await db.execute(
-        select(Video)
-        .where(Video.applicant_id == applicant_id)
-        .order_by(Video.created_at)
-    )
+    result = await db.execute(_GET_VIDEOS_FOR_APPLICANT, {"applicant_id": applicant_id})
     return list(result.scalars().all())
 
 
@@ -130,52 +208,70 @@ async def delete_videos_for_applicant(db: AsyncSession, applicant_id: int) -> in
 
 async def create_booking(db: AsyncSession, **kwargs) -> Booking:
     """Create a new booking"""
-    booking = Booking(**kwargs)
+    # Start with an empty, loaded logs collection so responses don't lazy-load it
+    booking = Booking(**kwargs, logs=[])
     db.add(booking)
     await db.commit()
-    await db.refresh(booking)
     return booking
 
 
 async def get_booking(db: AsyncSession, booking_id: int) -> Optional[Booking]:
     """Get booking by ID with logs"""
-    result = await db.execute(
-        select(Booking)
-        .options(selectinload(Booking.logs))
-        .where(Booking.id == booking_id)
-    )
-    return result.scalar_one_or_none()
+    result = await db.execute(_GET_BOOKING, {"id": booking_id})
+    return result.unique().scalar_one_or_none()
 
 
-async def get_bookings(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
-    applicant_id: Optional[int] = None,
-    status: Optional[str] = None
-) -> List[Booking]:
-    """Get list of bookings"""
-    query = select(Booking).options(selectinload(Booking.logs)).order_by(Booking.created_at.desc())
+async def booking_exists(db: AsyncSession, booking_id: int) -> bool:
+    """Check that a booking exists without loading it or its logs"""
+    result = await db.execute(_BOOKING_EXISTS, {"id": booking_id})
+    return result.scalar_one_or_none() is not None
+
+
+def _bookings_query(skip: int, limit: int, applicant_id: Optional[int], status: Optional[str]) -> Select:
+    """Build the booking listing query (without a loader strategy for logs)"""
+    query = select(Booking).order_by(Booking.created_at.desc(), Booking.id.desc())
 
     if applicant_id:
         query = query.where(Booking.applicant_id == applicant_id)
     if status:
         query = query.where(Booking.status == status)
 
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    return query.offset(skip).limit(limit)
+
+
+async def stream_bookings(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    applicant_id: Optional[int] = None,
+    status: Optional[str] = None
+) -> AsyncScalarResult:
+    """Stream bookings with their logs in batches of STREAM_BATCH_SIZE
+
+    Joined collection loading can't be streamed, so logs are selectin-loaded
+    once per batch.
+    """
+    query = (
+        _bookings_query(skip, limit, applicant_id, status)
+        .options(selectinload(Booking.logs))
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    return await db.stream_scalars(query)
 
 
 async def update_booking(db: AsyncSession, booking_id: int, **kwargs) -> Optional[Booking]:
     """Update a booking"""
-    await db.execute(
+    result = await db.execute(
         update(Booking)
         .where(Booking.id == booking_id)
-        .values(**kwargs, updated_at=datetime.utcnow())
+        .values(**kwargs)
+        .returning(Booking)
+        .options(selectinload(Booking.logs)),
+        execution_options={"populate_existing": True},
     )
+    booking = result.scalar_one_or_none()
     await db.commit()
-    return await get_booking(db, booking_id)
+    return booking
 
 
 async def delete_booking(db: AsyncSession, booking_id: int) -> bool:
@@ -189,17 +285,20 @@ async def delete_booking(db: AsyncSession, booking_id: int) -> bool:
 
 async def increment_booking_attempts(db: AsyncSession, booking_id: int) -> Optional[Booking]:
     """Increment booking attempts counter"""
-    await db.execute(
+    result = await db.execute(
         update(Booking)
         .where(Booking.id == booking_id)
         .values(
             attempts=Booking.attempts + 1,
-            last_attempt=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            last_attempt=func.now(),
         )
+        .returning(Booking)
+        .options(selectinload(Booking.logs)),
+        execution_options={"populate_existing": True},
     )
+    booking = result.scalar_one_or_none()
     await db.commit()
-    return await get_booking(db, booking_id)
+    return booking
 
 
 async def count_bookings(db: AsyncSession, status: Optional[str] = None) -> int:
@@ -218,51 +317,41 @@ async def create_booking_log(db: AsyncSession, **kwargs) -> BookingLog:
     log = BookingLog(**kwargs)
     db.add(log)
     await db.commit()
-    await db.refresh(log)
     return log
 
 
-async def get_booking_logs(db: AsyncSession, booking_id: int) -> List[BookingLog]:
-    """Get all logs for a booking"""
-    result = await db.execute(
-        select(BookingLog)
-        .where(BookingLog.booking_id == booking_id)
-        .order_by(BookingLog.created_at)
-    )
-    return list(result.scalars().all())
+async def stream_booking_logs(db: AsyncSession, booking_id: int) -> AsyncScalarResult:
+    """Stream all logs for a booking"""
+    return await db.stream_scalars(_GET_BOOKING_LOGS, {"booking_id": booking_id})
 
 
 # ============== Session CRUD ==============
 
-async def save_session(db: AsyncSession, name: str, cookies: str, **kwargs) -> Session:
+async def save_session(db: AsyncSession, name: str, cookies: list, **kwargs) -> Session:
     """Save or update browser session"""
+    # Session.name has no unique constraint, so try UPDATE ... RETURNING first
     result = await db.execute(
-        select(Session).where(Session.name == name)
+        update(Session)
+        .where(Session.name == name)
+        .values(cookies=cookies, **kwargs)
+        .returning(Session),
+        execution_options={"populate_existing": True},
     )
-    session = result.scalar_one_or_none()
+    session = result.scalars().first()
 
     if session:
-        await db.execute(
-            update(Session)
-            .where(Session.name == name)
-            .values(cookies=cookies, **kwargs, updated_at=datetime.utcnow())
-        )
         await db.commit()
-        result = await db.execute(select(Session).where(Session.name == name))
-        return result.scalar_one()
+        return session
     else:
         session = Session(name=name, cookies=cookies, **kwargs)
         db.add(session)
         await db.commit()
-        await db.refresh(session)
         return session
 
 
 async def get_session(db: AsyncSession, name: str = "default") -> Optional[Session]:
     """Get browser session by name"""
-    result = await db.execute(
-        select(Session).where(Session.name == name, Session.is_active == True)
-    )
+    result = await db.execute(_GET_ACTIVE_SESSION, {"name": name})
     return result.scalar_one_or_none()
 
 
@@ -271,7 +360,7 @@ async def invalidate_session(db: AsyncSession, name: str = "default") -> bool:
     result = await db.execute(
         update(Session)
         .where(Session.name == name)
-        .values(is_active=False, updated_at=datetime.utcnow())
+        .values(is_active=False)
     )
     await db.commit()
     return result.rowcount > 0
@@ -281,73 +370,42 @@ async def invalidate_session(db: AsyncSession, name: str = "default") -> bool:
 
 async def get_setting(db: AsyncSession, key: str) -> Optional[str]:
     """Get a setting value"""
-    result = await db.execute(
-        select(Settings).where(Settings.key == key)
-    )
-    setting = result.scalar_one_or_none()
-    return setting.value if setting else None
+    result = await db.execute(_GET_SETTING_VALUE, {"key": key})
+    return result.scalar_one_or_none()
 
 
 async def set_setting(db: AsyncSession, key: str, value: str, description: str = None) -> Settings:
-    """Set a setting value"""
+    """Set a setting value (upsert on the unique key)"""
     result = await db.execute(
-        select(Settings).where(Settings.key == key)
-    )
-    setting = result.scalar_one_or_none()
-
-    if setting:
-        await db.execute(
-            update(Settings)
-            .where(Settings.key == key)
-            .values(value=value, updated_at=datetime.utcnow())
+        sqlite_insert(Settings)
+        .values(key=key, value=value, description=description)
+        .on_conflict_do_update(
+            index_elements=[Settings.key],
+            set_={"value": value, "updated_at": func.now()},
         )
-        await db.commit()
-        result = await db.execute(select(Settings).where(Settings.key == key))
-        return result.scalar_one()
-    else:
-        setting = Settings(key=key, value=value, description=description)
-        db.add(setting)
-        await db.commit()
-        await db.refresh(setting)
-        return setting
+        .returning(Settings),
+        execution_options={"populate_existing": True},
+    )
+    setting = result.scalar_one()
+    await db.commit()
+    return setting
 
 
 # ============== Statistics ==============
 
 async def get_statistics(db: AsyncSession) -> dict:
-    """Get overall statistics"""
-    total_applicants = await count_applicants(db)
-    pending_applicants = await count_applicants(db, status="pending")
-    booked_applicants = await count_applicants(db, status="booked")
-    failed_applicants = await count_applicants(db, status="failed")
-
-    total_bookings = await count_bookings(db)
-    successful_bookings = await count_bookings(db, status="success")
-    failed_bookings = await count_bookings(db, status="failed")
-
-    # Average attempts
-    result = await db.execute(
-        select(func.avg(Booking.attempts)).where(Booking.status == "success")
-    )
-    avg_attempts = result.scalar() or 0
-
-    # Last successful booking
-    result = await db.execute(
-        select(Booking.updated_at)
-        .where(Booking.status == "success")
-        .order_by(Booking.updated_at.desc())
-        .limit(1)
-    )
-    last_success = result.scalar_one_or_none()
+    """Get overall statistics (single round-trip via conditional aggregation)"""
+    result = await db.execute(_STATISTICS)
+    row = result.one()
 
     return {
-        "total_applicants": total_applicants,
-        "pending_applicants": pending_applicants,
-        "booked_applicants": booked_applicants,
-        "failed_applicants": failed_applicants,
-        "total_bookings": total_bookings,
-        "successful_bookings": successful_bookings,
-        "failed_bookings": failed_bookings,
-        "average_attempts": round(avg_attempts, 2),
-        "last_successful_booking": last_success,
+        "total_applicants": row.total_applicants or 0,
+        "pending_applicants": row.pending_applicants or 0,
+        "booked_applicants": row.booked_applicants or 0,
+        "failed_applicants": row.failed_applicants or 0,
+        "total_bookings": row.total_bookings or 0,
+        "successful_bookings": row.successful_bookings or 0,
+        "failed_bookings": row.failed_bookings or 0,
+        "average_attempts": round(row.average_attempts or 0, 2),
+        "last_successful_booking": row.last_successful_booking,
     }
@@ -1,9 +1,12 @@
 """
 Database connection and session management
 """
-from sqlalchemy import text
+import orjson
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.schema import CreateTable
+from loguru import logger
 from .config import settings
 
 # Create async engine
@@ -11,8 +14,32 @@ engine = create_async_engine(
     settings.database_url,
     echo=False,
     future=True,
+    query_cache_size=1200,
+    insertmanyvalues_page_size=1000,
+    # JSON columns are (de)serialized with orjson instead of the stdlib json module
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
 )
 
+# SQLite pragmas applied to every new pooled connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL + synchronous=NORMAL: fsync per checkpoint instead of per commit"""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
 # Create async session factory
 async_session = async_sessionmaker(
     engine,
@@ -41,10 +68,22 @@ async def init_db():
                     f"ALTER TABLE applicants ADD COLUMN {col_name} {col_type}"
                 ))
 
+        # Rebuild tables created before timestamps moved to server-side defaults
+        for table in Base.metadata.sorted_tables:
+            if await _server_defaults_missing(conn, table):
+                await _rebuild_table(conn, table)
+
         # Migrate existing face videos from face_photo_path dirs to videos table
         if not await _table_missing(conn, "videos"):
             await _migrate_face_videos_to_table(conn)
 
+        # create_all only builds indexes together with new tables; add any missing ones
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+
+        await conn.execute(text("PRAGMA optimize"))
+
 
 async def _table_missing(conn, table: str) -> bool:
     """Check if a table exists (SQLite)"""
@@ -80,6 +119,43 @@ async def _migrate_face_videos_to_table(conn):
                         ), {"aid": applicant_id, "fp": str(f), "fn": f.name, "sz": f.stat().st_size})
 
 
+async def _server_defaults_missing(conn, table) -> bool:
+    """Check if a table lacks DEFAULTs the model declares via server_default (SQLite)"""
+    result = await conn.execute(text(f"PRAGMA table_info({table.name})"))
+    defaults = {row[1]: row[4] for row in result.fetchall()}
+    return any(
+        column.server_default is not None and column.name in defaults and defaults[column.name] is None
+        for column in table.columns
+    )
+
+
+async def _rebuild_table(conn, table):
+    """Recreate a table from its model definition, keeping its rows (SQLite)
+
+    SQLite can't ALTER a column's DEFAULT, so this follows its documented
+    create-copy-drop-rename procedure. Indexes are recreated by init_db.
+    """
+    result = await conn.execute(text(f"PRAGMA table_info({table.name})"))
+    existing = [row[1] for row in result.fetchall()]
+    model_columns = [column.name for column in table.columns]
+    if not set(existing) <= set(model_columns):
+        logger.warning(f"Not rebuilding {table.name}: it has columns the model doesn't know about")
+        return
+
+    tmp_name = f"{table.name}__rebuild"
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+    ddl = ddl.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {tmp_name} ", 1)
+    columns = ", ".join(existing)
+
+    for index in table.indexes:
+        await conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    await conn.execute(text(ddl))
+    await conn.execute(text(f"INSERT INTO {tmp_name} ({columns}) SELECT {columns} FROM {table.name}"))
+    await conn.execute(text(f"DROP TABLE {table.name}"))
+    await conn.execute(text(f"ALTER TABLE {tmp_name} RENAME TO {table.name}"))
+    logger.info(f"Rebuilt table {table.name} with server-side defaults")
+
+
 async def _column_missing(conn, table: str, column: str) -> bool:
     """Check if a column is missing from a table (SQLite)"""
     result = await conn.execute(text(f"PRAGMA table_info({table})"))
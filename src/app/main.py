@@ -4,18 +4,20 @@ FastAPI Application - VFS Booking Bot API
 import asyncio
 import sys
 import threading
+import time
 from contextlib import asynccontextmanager
 from typing import List, Optional
-from fastapi import FastAPI, Depends, HTTPException, status, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, status, BackgroundTasks, UploadFile, File, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
 import shutil
+import orjson
 from loguru import logger
 
-from .config import settings
-from .database import init_db, get_session
+from .config import settings, uvicorn_fast_options
+from .database import init_db, get_session, async_session
 from . import crud, schemas
 
 
@@ -27,6 +29,10 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting VFS Booking Bot API...")
 
+    # Let coroutines that finish without suspending skip the ready queue (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     # Ensure directories exist
     settings.screenshots_dir.mkdir(parents=True, exist_ok=True)
     settings.logs_dir.mkdir(parents=True, exist_ok=True)
@@ -35,6 +41,11 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
 
+    # Resolve the dashboard page once instead of on every request
+    global _dashboard_index
+    index_path = dashboard_path / "templates" / "index.html"
+    _dashboard_index = index_path if index_path.exists() else None
+
     yield
 
     # Shutdown
@@ -52,6 +63,7 @@ app = FastAPI(
 
 # Mount static files for dashboard
 dashboard_path = Path(__file__).parent.parent / "dashboard"
+_dashboard_index: Optional[Path] = None  # set in lifespan
 if dashboard_path.exists():
     app.mount("/static", StaticFiles(directory=dashboard_path / "static"), name="static")
 
@@ -61,12 +73,38 @@ if dashboard_path.exists():
 @app.get("/", response_class=HTMLResponse)
 async def dashboard():
     """Serve dashboard HTML"""
-    index_path = dashboard_path / "templates" / "index.html"
-    if index_path.exists():
-        return FileResponse(index_path)
+    if _dashboard_index:
+        return FileResponse(_dashboard_index)
     return HTMLResponse("<h1>VFS Booking Bot API</h1><p>Dashboard not found. Visit /docs for API documentation.</p>")
 
 
+# ============== Response Helpers ==============
+
+def _orjson_response(data: dict) -> Response:
+    """Encode a dict that was dumped without validation straight to JSON bytes"""
+    return Response(orjson.dumps(data), media_type="application/json")
+
+
+def _stream_json_array(open_stream, schema) -> StreamingResponse:
+    """Stream rows as a JSON array, encoding one batch at a time.
+
+    open_stream(db) must return an AsyncScalarResult. The generator opens its
+    own session because it runs after the request's dependencies have closed.
+    """
+    async def generate():
+        async with async_session() as db:
+            result = await open_stream(db)
+            yield b"["
+            first = True
+            async for batch in result.partitions(crud.STREAM_BATCH_SIZE):
+                chunk = b",".join(orjson.dumps(schema.dump_orm_fast(row)) for row in batch)
+                yield chunk if first else b"," + chunk
+                first = False
+            yield b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
 # ============== Applicant Routes ==============
 
 @app.post("/api/applicants", response_model=schemas.ApplicantResponse, status_code=status.HTTP_201_CREATED)
@@ -75,26 +113,39 @@ async def create_applicant(
     db: AsyncSession = Depends(get_session)
 ):
     """Create a new applicant"""
-    # Check for duplicate passport
-    existing = await crud.get_applicant_by_passport(db, applicant.passport_number)
-    if existing:
+    created = await crud.create_applicant_if_new(db, **applicant.model_dump())
+    if not created:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Applicant with passport {applicant.passport_number} already exists"
         )
+    _invalidate_statistics()
+    return created
 
-    return await crud.create_applicant(db, **applicant.model_dump())
+
+@app.post("/api/applicants/import", status_code=status.HTTP_201_CREATED)
+async def import_applicants(
+    applicants: List[schemas.ApplicantCreate],
+    db: AsyncSession = Depends(get_session)
+):
+    """Bulk-create applicants, skipping passport numbers that already exist"""
+    ids = await crud.bulk_create_applicants(db, [a.model_dump() for a in applicants])
+    if ids:
+        _invalidate_statistics()
+    return {"created": len(ids), "skipped": len(applicants) - len(ids), "ids": ids}
 
 
 @app.get("/api/applicants", response_model=List[schemas.ApplicantResponse])
 async def list_applicants(
     skip: int = 0,
     limit: int = 100,
-    status: Optional[str] = None,
-    db: AsyncSession = Depends(get_session)
+    status: Optional[str] = None
 ):
     """List all applicants"""
-    return await crud.get_applicants(db, skip=skip, limit=limit, status=status)
+    return _stream_json_array(
+        lambda session: crud.stream_applicants(session, skip=skip, limit=limit, status=status),
+        schemas.ApplicantResponse,
+    )
 
 
 @app.get("/api/applicants/{applicant_id}", response_model=schemas.ApplicantResponse)
@@ -106,7 +157,7 @@ async def get_applicant(
     applicant = await crud.get_applicant(db, applicant_id)
     if not applicant:
         raise HTTPException(status_code=404, detail="Applicant not found")
-    return applicant
+    return _orjson_response(schemas.ApplicantResponse.dump_orm_fast(applicant))
 
 
 @app.put("/api/applicants/{applicant_id}", response_model=schemas.ApplicantResponse)
@@ -124,7 +175,9 @@ async def update_applicant(
     if not update_data:
         return existing
 
-    return await crud.update_applicant(db, applicant_id, **update_data)
+    updated = await crud.update_applicant(db, applicant_id, **update_data)
+    _invalidate_statistics()
+    return updated
 
 
 @app.delete("/api/applicants/{applicant_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -136,6 +189,7 @@ async def delete_applicant(
     deleted = await crud.delete_applicant(db, applicant_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Applicant not found")
+    _invalidate_statistics()
 
 
 @app.post("/api/applicants/{applicant_id}/upload/{photo_type}")
@@ -278,7 +332,9 @@ async def create_booking(
     if not applicant:
         raise HTTPException(status_code=404, detail="Applicant not found")
 
-    return await crud.create_booking(db, **booking.model_dump())
+    created = await crud.create_booking(db, **booking.model_dump())
+    _invalidate_statistics()
+    return created
 
 
 @app.get("/api/bookings", response_model=List[schemas.BookingResponse])
@@ -286,11 +342,15 @@ async def list_bookings(
     skip: int = 0,
     limit: int = 100,
     applicant_id: Optional[int] = None,
-    status: Optional[str] = None,
-    db: AsyncSession = Depends(get_session)
+    status: Optional[str] = None
 ):
     """List all bookings"""
-    return await crud.get_bookings(db, skip=skip, limit=limit, applicant_id=applicant_id, status=status)
+    return _stream_json_array(
+        lambda session: crud.stream_bookings(
+            session, skip=skip, limit=limit, applicant_id=applicant_id, status=status
+        ),
+        schemas.BookingResponse,
+    )
 
 
 @app.get("/api/bookings/{booking_id}", response_model=schemas.BookingResponse)
@@ -302,7 +362,7 @@ async def get_booking(
     booking = await crud.get_booking(db, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
-    return booking
+    return _orjson_response(schemas.BookingResponse.dump_orm_fast(booking))
 
 
 @app.delete("/api/bookings/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -314,6 +374,7 @@ async def delete_booking(
     deleted = await crud.delete_booking(db, booking_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Booking not found")
+    _invalidate_statistics()
 
 
 @app.get("/api/bookings/{booking_id}/logs", response_model=List[schemas.BookingLogResponse])
@@ -322,18 +383,52 @@ async def get_booking_logs(
     db: AsyncSession = Depends(get_session)
 ):
     """Get logs for a booking"""
-    booking = await crud.get_booking(db, booking_id)
-    if not booking:
+    if not await crud.booking_exists(db, booking_id):
         raise HTTPException(status_code=404, detail="Booking not found")
-    return await crud.get_booking_logs(db, booking_id)
+    return _stream_json_array(
+        lambda session: crud.stream_booking_logs(session, booking_id),
+        schemas.BookingLogResponse,
+    )
 
 
 # ============== Statistics Routes ==============
 
+# Short-lived cache so dashboard polling doesn't hit the DB on every request
+# "generation" is bumped by _invalidate_statistics so a computation that started
+# before a write doesn't store its stale result
+_stats_cache = {"value": None, "expires": 0.0, "generation": 0}
+_stats_lock = asyncio.Lock()
+
+
+async def _cached_statistics(db: AsyncSession) -> dict:
+    """Return statistics, recomputing at most once per stats_cache_ttl seconds"""
+    if _stats_cache["value"] is not None and time.monotonic() < _stats_cache["expires"]:
+        return _stats_cache["value"]
+
+    # Concurrent requests wait for the in-flight computation instead of repeating it
+    async with _stats_lock:
+        if _stats_cache["value"] is not None and time.monotonic() < _stats_cache["expires"]:
+            return _stats_cache["value"]
+        generation = _stats_cache["generation"]
+        value = await crud.get_statistics(db)
+        if generation == _stats_cache["generation"]:
+            _stats_cache["value"] = value
+            _stats_cache["expires"] = time.monotonic() + settings.stats_cache_ttl
+        return value
+
+
+def _invalidate_statistics():
+    """Drop cached statistics after a write so the next read sees it"""
+    _stats_cache["value"] = None
+    _stats_cache["generation"] += 1
+
+
 @app.get("/api/stats", response_model=schemas.StatsResponse)
-async def get_statistics(db: AsyncSession = Depends(get_session)):
+async def get_statistics(response: Response, db: AsyncSession = Depends(get_session)):
     """Get overall statistics"""
-    return await crud.get_statistics(db)
+    # The dashboard re-fetches right after its own writes; make the browser revalidate
+    response.headers["Cache-Control"] = "no-cache"
+    return await _cached_statistics(db)
 
 
 # ============== Bot Control Routes ==============
@@ -390,6 +485,7 @@ async def _run_bot(applicant_dicts: list):
     try:
         from ..automation.browser import BrowserManager
         from ..automation.monitor import SlotMonitor
+        from ..services.notification import NotificationService
     except Exception as e:
         import traceback
         error_msg = f"Failed to import automation modules: {e}\n{traceback.format_exc()}"
@@ -401,20 +497,19 @@ async def _run_bot(applicant_dicts: list):
 
     try:
         _browser = BrowserManager()
+        notifications = NotificationService()
 
         async def on_slot_found(event, data):
             bot_state["total_success"] += 1
             logger.info(f"Bot event: {event} - {data}")
             try:
-                from ..services.notification import NotificationService
-                ns = NotificationService()
                 if event == "slot_found":
                     message = data.get("message", "Slots available!")
-                    await ns.notify_slot_found([message])
+                    await notifications.notify_slot_found([message])
                 elif event == "booking_success":
                     applicant = data.get("applicant", {})
                     confirmation = data.get("confirmation", {})
-                    await ns.notify_booking_success(
+                    await notifications.notify_booking_success(
                         f"{applicant.get('first_name', '')} {applicant.get('last_name', '')}",
                         str(confirmation.get("appointment_date", "Unknown")),
                         confirmation_code=confirmation.get("appointment_ref"),
@@ -427,9 +522,7 @@ async def _run_bot(applicant_dicts: list):
             bot_state["current_step"] = f"Error: {event}"
             logger.error(f"Bot error: {event} - {data}")
             try:
-                from ..services.notification import NotificationService
-                ns = NotificationService()
-                await ns.notify_error(str(data), event)
+                await notifications.notify_error(str(data), event)
             except Exception:
                 pass
 
@@ -605,4 +698,5 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         reload=True,
+        **uvicorn_fast_options(),
     )
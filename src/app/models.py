@@ -2,8 +2,8 @@
 Database models for VFS Booking Bot
 """
 from datetime import datetime, date
-from typing import Optional, List
-from sqlalchemy import String, Integer, DateTime, Date, Text, ForeignKey, Boolean
+from typing import Any, Optional, List
+from sqlalchemy import String, Integer, DateTime, Date, Text, ForeignKey, Boolean, Index, JSON, desc, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .database import Base
 
@@ -11,6 +11,15 @@ from .database import Base
 class Applicant(Base):
     """Applicant model - stores visa applicant information"""
     __tablename__ = "applicants"
+    __table_args__ = (
+        Index("ix_applicants_status_priority", "status", "priority"),
+        Index("ix_applicants_priority_created", desc("priority"), "created_at"),
+        # Bot dispatch queue: only pending rows, already in listing order
+        Index(
+            "ix_applicants_pending", desc("priority"), "created_at",
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -30,12 +39,13 @@ class Applicant(Base):
     passport_front_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     passport_page_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    # Relationships
-    bookings: Mapped[List["Booking"]] = relationship("Booking", back_populates="applicant", cascade="all, delete-orphan")
-    videos: Mapped[List["Video"]] = relationship("Video", back_populates="applicant", cascade="all, delete-orphan")
+    # Relationships - lazy="raise_on_sql": an implicit lazy load would fail under
+    # asyncio anyway, so query sites must pick selectinload/joinedload explicitly
+    bookings: Mapped[List["Booking"]] = relationship("Booking", back_populates="applicant", lazy="raise_on_sql", cascade="all, delete-orphan")
+    videos: Mapped[List["Video"]] = relationship("Video", back_populates="applicant", lazy="raise_on_sql", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Applicant {self.first_name} {self.last_name} ({self.passport_number})>"
@@ -44,6 +54,9 @@ class Applicant(Base):
 class Video(Base):
     """Video model - stores face videos for identity verification (1:N with Applicant)"""
     __tablename__ = "videos"
+    __table_args__ = (
+        Index("ix_videos_applicant_id", "applicant_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     applicant_id: Mapped[int] = mapped_column(Integer, ForeignKey("applicants.id"), nullable=False)
@@ -51,10 +64,10 @@ class Video(Base):
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     file_type: Mapped[str] = mapped_column(String(50), default="face_video")  # face_video
     size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     # Relationships
-    applicant: Mapped["Applicant"] = relationship("Applicant", back_populates="videos")
+    applicant: Mapped["Applicant"] = relationship("Applicant", back_populates="videos", lazy="raise_on_sql")
 
     def __repr__(self):
         return f"<Video {self.filename} for Applicant {self.applicant_id}>"
@@ -63,6 +76,10 @@ class Video(Base):
 class Booking(Base):
     """Booking model - stores booking attempts and results"""
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_applicant_status", "applicant_id", "status"),
+        Index("ix_bookings_status_updated", "status", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     applicant_id: Mapped[int] = mapped_column(Integer, ForeignKey("applicants.id"), nullable=False)
@@ -77,12 +94,12 @@ class Booking(Base):
     attempts: Mapped[int] = mapped_column(Integer, default=0)
     last_attempt: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    applicant: Mapped["Applicant"] = relationship("Applicant", back_populates="bookings")
-    logs: Mapped[List["BookingLog"]] = relationship("BookingLog", back_populates="booking", cascade="all, delete-orphan")
+    applicant: Mapped["Applicant"] = relationship("Applicant", back_populates="bookings", lazy="raise_on_sql")
+    logs: Mapped[List["BookingLog"]] = relationship("BookingLog", back_populates="booking", lazy="raise_on_sql", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Booking {self.id} for Applicant {self.applicant_id} - {self.status}>"
@@ -91,6 +108,9 @@ class Booking(Base):
 class BookingLog(Base):
     """Booking log model - stores detailed logs for each booking step"""
     __tablename__ = "booking_logs"
+    __table_args__ = (
+        Index("ix_booking_logs_booking_id", "booking_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     booking_id: Mapped[int] = mapped_column(Integer, ForeignKey("bookings.id"), nullable=False)
@@ -99,10 +119,10 @@ class BookingLog(Base):
     message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     screenshot_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     # Relationships
-    booking: Mapped["Booking"] = relationship("Booking", back_populates="logs")
+    booking: Mapped["Booking"] = relationship("Booking", back_populates="logs", lazy="raise_on_sql")
 
     def __repr__(self):
         return f"<BookingLog {self.step} - {self.status}>"
@@ -111,16 +131,19 @@ class BookingLog(Base):
 class Session(Base):
     """Session model - stores browser session data for persistence"""
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_name_active", "name", "is_active"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), default="default")
-    cookies: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON string
-    local_storage: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON string
+    cookies: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    local_storage: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
     user_agent: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
     def __repr__(self):
         return f"<Session {self.name} - Active: {self.is_active}>"
@@ -134,7 +157,7 @@ class Settings(Base):
     key: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     value: Mapped[str] = mapped_column(Text, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
     def __repr__(self):
         return f"<Settings {self.key}>"
@@ -2,8 +2,42 @@
 Pydantic schemas for API request/response validation
 """
 from datetime import datetime, date
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field
+from functools import lru_cache
+from typing import Literal, Optional, List, get_args
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+
+# ============== ORM Response Base ==============
+
+@lru_cache(maxsize=None)
+def _orm_fields(schema) -> tuple:
+    """(field name, nested list item schema or None) for each field of a response schema"""
+    fields = []
+    for name, field in schema.model_fields.items():
+        nested = None
+        for arg in get_args(field.annotation):
+            if isinstance(arg, type) and issubclass(arg, OrmResponse):
+                nested = arg
+        fields.append((name, nested))
+    return tuple(fields)
+
+
+class OrmResponse(BaseModel):
+    """Base for response schemas read from SQLAlchemy models"""
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def dump_orm_fast(cls, obj) -> dict:
+        """Dump an ORM row as this schema's fields without running validators.
+
+        Only for rows read back from our own database, which were validated on
+        the way in.
+        """
+        data = {}
+        for name, nested in _orm_fields(cls):
+            value = getattr(obj, name)
+            data[name] = [nested.dump_orm_fast(item) for item in value] if nested else value
+        return data
 
 
 # ============== Applicant Schemas ==============
@@ -19,7 +53,7 @@ class ApplicantBase(BaseModel):
     passport_expiry: date
     date_of_birth: date
     nationality: str = Field(default="Angola", max_length=50)
-    gender: str = Field(default="Male", pattern="^(Male|Female)$")
+    gender: Literal["Male", "Female"] = "Male"
     visa_type: str = Field(default="TOURIST", max_length=50)
     priority: int = Field(default=0, ge=0, le=100)
     face_photo_path: Optional[str] = None
@@ -44,7 +78,7 @@ class ApplicantUpdate(BaseModel):
     passport_expiry: Optional[date] = None
     date_of_birth: Optional[date] = None
     nationality: Optional[str] = Field(None, max_length=50)
-    gender: Optional[str] = Field(None, pattern="^(Male|Female)$")
+    gender: Optional[Literal["Male", "Female"]] = None
     visa_type: Optional[str] = Field(None, max_length=50)
     priority: Optional[int] = Field(None, ge=0, le=100)
     status: Optional[str] = None
@@ -54,20 +88,17 @@ class ApplicantUpdate(BaseModel):
     notes: Optional[str] = None
 
 
-class ApplicantResponse(ApplicantBase):
+class ApplicantResponse(ApplicantBase, OrmResponse):
     """Schema for applicant response"""
     id: int
     status: str
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # ============== Video Schemas ==============
 
-class VideoResponse(BaseModel):
+class VideoResponse(OrmResponse):
     """Schema for video response"""
     id: int
     applicant_id: int
@@ -77,9 +108,6 @@ class VideoResponse(BaseModel):
     size_bytes: Optional[int]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # ============== Booking Schemas ==============
 
@@ -107,7 +135,7 @@ class BookingUpdate(BaseModel):
     error_message: Optional[str] = None
 
 
-class BookingLogResponse(BaseModel):
+class BookingLogResponse(OrmResponse):
     """Schema for booking log response"""
     id: int
     step: str
@@ -117,11 +145,8 @@ class BookingLogResponse(BaseModel):
     screenshot_path: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
 
-
-class BookingResponse(BookingBase):
+class BookingResponse(BookingBase, OrmResponse):
     """Schema for booking response"""
     id: int
     applicant_id: int
@@ -137,9 +162,6 @@ class BookingResponse(BookingBase):
     updated_at: datetime
     logs: List[BookingLogResponse] = []
 
-    class Config:
-        from_attributes = True
-
 
 # ============== Bot Control Schemas ==============
 
@@ -173,7 +195,7 @@ class SlotCheckResponse(BaseModel):
 
 class NotificationTestRequest(BaseModel):
     """Schema for testing notifications"""
-    type: str = Field(..., pattern="^(telegram|email)$")
+    type: Literal["telegram", "email"]
     message: str = Field(default="Test notification from VFS Bot")
 
 
@@ -1,18 +1,30 @@
 """
 VFS Booking Bot - Automation Package
+
+Exports are imported lazily (PEP 562) so importing one submodule doesn't pull
+in Playwright and the rest of the automation stack.
 """
-from .browser import BrowserManager
-from .login import LoginAutomation
-from .turnstile import TurnstileSolver
-from .booking import BookingAutomation
-from .monitor import SlotMonitor
-from .identity_verification import IdentityVerificationHandler
+import importlib
+
+_LAZY = {
+    "BrowserManager": "browser",
+    "LoginAutomation": "login",
+    "TurnstileSolver": "turnstile",
+    "BookingAutomation": "booking",
+    "SlotMonitor": "monitor",
+    "IdentityVerificationHandler": "identity_verification",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = [
-    "BrowserManager",
-    "LoginAutomation",
-    "TurnstileSolver",
-    "BookingAutomation",
-    "SlotMonitor",
-    "IdentityVerificationHandler",
-]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -11,12 +11,14 @@ import asyncio
 import json
 import os
 import platform
+import random
 import shutil
 import socket
 import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
+import aiofiles
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from loguru import logger
 
@@ -425,8 +427,8 @@ class BrowserManager:
             }
 
             self._session_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._session_file, "w") as f:
-                json.dump(session_data, f, indent=2)
+            async with aiofiles.open(self._session_file, "w") as f:
+                await f.write(json.dumps(session_data, indent=2))
 
             logger.info(f"Session saved to {self._session_file}")
         except Exception as e:
@@ -439,8 +441,8 @@ class BrowserManager:
             return
 
         try:
-            with open(self._session_file, "r") as f:
-                session_data = json.load(f)
+            async with aiofiles.open(self._session_file, "r") as f:
+                session_data = json.loads(await f.read())
 
             # Check if session is expired
             expires_at = datetime.fromisoformat(session_data.get("expires_at", "2000-01-01"))
@@ -501,7 +503,6 @@ class BrowserManager:
 
     async def random_delay(self, min_ms: int = 500, max_ms: int = 1500):
         """Add random human-like delay"""
-        import random
         delay = random.randint(min_ms, max_ms) / 1000
         await asyncio.sleep(delay)
 
@@ -528,7 +529,6 @@ class BrowserManager:
             # Get element bounds
             box = await element.bounding_box()
             if box:
-                import random
                 # Click at random position within element
                 x = box["x"] + random.uniform(5, box["width"] - 5)
                 y = box["y"] + random.uniform(5, box["height"] - 5)